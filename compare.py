@@ -4,17 +4,27 @@ Unified drug overlap comparison pipeline.
 Consolidates all comparison functionality into a single, efficient script.
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import argparse
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
+from rapidfuzz import process
+from rapidfuzz.distance import JaroWinkler
+
+try:
+    import polars as pl
+except ImportError:  # phase-2 prep falls back to the Arrow compute path
+    pl = None
+
 from src.core.logging_config import setup_logging, get_logger
-from src.core.matching import (
-    optimized_fuzzy_matching, process_id_matches,
-    jaro_winkler_similarity
-)
-from src.utils.text import normalize
+from src.core.matching import optimized_fuzzy_matching, process_id_matches
+from src.utils.text import normalize, normalize_series
 from src.utils.synonyms import load_synonyms
 from src.config import PROC
 
@@ -29,13 +39,42 @@ setup_logging()
 logger = get_logger(__name__)
 
 
-def load_dataset(name: str, raw_dir: Path) -> pd.DataFrame:
-    """Load dataset variant with appropriate handling."""
+# Columns the comparison pipeline actually consumes; wide tables like
+# fda_clean carry many more that never need to leave the Parquet file
+DATASET_COLUMNS = [
+    'Drug Name', 'RxCUI', 'Indication', 'Date of Approval',
+    'Sr.No', 'Strength', 'Original Drug Name', 'Is Combination',
+]
+
+
+def load_dataset(name: str, raw_dir: Path,
+                 columns: Optional[list] = None) -> pd.DataFrame:
+    """Load dataset variant with appropriate handling.
+
+    Loads are memoized per (name, raw_dir, columns); callers receive a
+    copy so in-place column additions never leak into the cache.
+    """
+    columns_key = tuple(columns) if columns is not None else None
+    return _load_dataset_cached(name, str(raw_dir), columns_key).copy()
+
+
+@lru_cache(maxsize=None)
+def _load_dataset_cached(name: str, raw_dir: str,
+                         columns_key: Optional[tuple]) -> pd.DataFrame:
+    raw_dir = Path(raw_dir)
+    columns = list(columns_key) if columns_key is not None else DATASET_COLUMNS
+
     # Use processed parquet files when available
     if name in ["cdsco_clean", "fda_clean", "cdsco_exploded"]:
         path = PROC / f"{name}.parquet"
         if path.exists():
-            return pd.read_parquet(path)
+            # Intersect with the file schema so variant schemas don't
+            # raise, and only materialize the projected columns
+            available = pq.ParquetFile(path).schema_arrow.names
+            wanted = [col for col in columns if col in available]
+            return pd.read_parquet(path, columns=wanted or None,
+                                   engine='pyarrow',
+                                   dtype_backend='pyarrow')
     
     # Load raw CSV variants
     csv_path = raw_dir / f"{name}.csv"
@@ -54,62 +93,103 @@ def load_dataset(name: str, raw_dir: Path) -> pd.DataFrame:
 def enrich_names_only(names_df: pd.DataFrame, raw_dir: Path) -> pd.DataFrame:
     """
     Enrich names-only data with metadata from other sources.
-    Decision: Use fuzzy matching with substring checks for robustness.
+    Decision: Exact lookup on normalized names, then batch Jaro-Winkler
+    scoring of the misses against every key for robustness.
     """
     # Load enrichment sources
     unclean_df = load_dataset("unclean_cdsco", raw_dir)
     vikram_df = load_dataset("vikram_cdsco_clean", raw_dir)
     
     # Pre-compute normalized lookups for efficiency
-    names_df['norm_name'] = names_df['Drug Name'].apply(normalize)
-    
-    # Build lookup dictionaries
-    indication_lookup = {}
-    for _, row in unclean_df.iterrows():
-        norm = normalize(row.get('Drug Name', ''))
-        if norm and pd.notna(row.get('Indication')):
-            indication_lookup[norm] = row['Indication']
-    
-    date_lookup = {}
-    for _, row in vikram_df.iterrows():
-        norm = normalize(row.get('Drug Name', ''))
-        if norm and pd.notna(row.get('Date of Approval')):
-            date_lookup[norm] = row['Date of Approval']
-    
-    # Vectorized enrichment with fuzzy fallback
-    def find_best_match(norm_name: str, lookup: Dict[str, str], 
-                        threshold: float = 0.8) -> str:
-        """Find best matching value using exact or fuzzy match."""
-        # Exact match first
-        if norm_name in lookup:
-            return lookup[norm_name]
-        
-        # Fuzzy match with substring optimization
-        best_score = 0
-        best_value = ''
-        
-        for candidate_norm, value in lookup.items():
-            # Quick substring check before expensive similarity
-            if norm_name in candidate_norm or candidate_norm in norm_name:
-                score = jaro_winkler_similarity(norm_name, candidate_norm)
-                if score > best_score and score >= threshold:
-                    best_score = score
-                    best_value = value
-        
-        return best_value
+    names_df['norm_name'] = normalize_series(names_df['Drug Name'])
+    
+    # Build lookup dictionaries with vectorized Series ops
+    def build_lookup(df: pd.DataFrame, value_column: str) -> Dict[str, str]:
+        if 'Drug Name' not in df.columns or value_column not in df.columns:
+            return {}
+        norms = normalize_series(df['Drug Name'])
+        mask = norms.str.len().gt(0) & df[value_column].notna()
+        return dict(zip(norms[mask], df.loc[mask, value_column]))
+
+    indication_lookup = build_lookup(unclean_df, 'Indication')
+    date_lookup = build_lookup(vikram_df, 'Date of Approval')
     
-    # Apply enrichment
-    names_df['Indication'] = names_df['norm_name'].apply(
-        lambda x: find_best_match(x, indication_lookup)
-    )
-    names_df['Date of Approval'] = names_df['norm_name'].apply(
-        lambda x: find_best_match(x, date_lookup)
-    )
+    # Materialize key lists once so cdist scores a stable sequence
+    indication_keys = list(indication_lookup.keys())
+    date_keys = list(date_lookup.keys())
+    norm_names = names_df['norm_name'].tolist()
+
+    # Batched enrichment with fuzzy fallback
+    def fuzzy_fill(lookup: Dict[str, str], keys: list,
+                   threshold: float = 0.8) -> list:
+        """Resolve each name to a value via exact or batch fuzzy match."""
+        values = [lookup.get(name, '') for name in norm_names]
+        pending = [i for i, name in enumerate(norm_names)
+                   if name not in lookup]
+        if not pending or not keys:
+            return values
+        # One cdist call scores all unresolved names against all keys
+        # in C with a worker per core; score_cutoff zeroes sub-threshold
+        # cells, so a below-cutoff row maximum means no acceptable key.
+        # float64 keeps near-tied keys distinct, as extractOne would
+        scores = process.cdist(
+            [norm_names[i] for i in pending], keys,
+            scorer=JaroWinkler.normalized_similarity,
+            score_cutoff=threshold, workers=-1, dtype=np.float64
+        )
+        best = scores.argmax(axis=1)
+        for row, i in enumerate(pending):
+            if scores[row, best[row]] >= threshold:
+                values[i] = lookup[keys[best[row]]]
+        return values
+
+    names_df['Indication'] = fuzzy_fill(indication_lookup, indication_keys)
+    names_df['Date of Approval'] = fuzzy_fill(date_lookup, date_keys)
     
     return names_df.drop(columns=['norm_name'])
 
 
-def standardize_columns(df: pd.DataFrame, 
+def prepare_for_matching(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize Drug Name and keep the first row per non-empty norm in a
+    single Arrow compute pass: dictionary-encode the norms, length-test
+    each unique value once, and slice the frame one time. Replaces the
+    separate apply / length-mask / drop_duplicates passes.
+
+    When polars is available the same chain runs as one lazy query so
+    its optimizer fuses the normalize, filter, and unique steps in the
+    multithreaded engine; the hand-rolled Arrow pass is the fallback.
+    """
+    if pl is not None:
+        lazy = (
+            pl.from_pandas(df).lazy()
+            .with_columns(
+                pl.col("Drug Name")
+                .map_elements(normalize, return_dtype=pl.Utf8)
+                .alias("drug_norm")
+            )
+            .filter(pl.col("drug_norm").str.len_chars() > 0)
+            .unique(subset="drug_norm", keep="first", maintain_order=True)
+        )
+        return lazy.collect().to_pandas(use_pyarrow_extension_array=True)
+
+    norms = pa.array(normalize_series(df["Drug Name"]), type=pa.string())
+    encoded = pc.dictionary_encode(norms)
+    codes = encoded.indices.to_numpy(zero_copy_only=False)
+    unique_lengths = pc.utf8_length(
+        encoded.dictionary
+    ).to_numpy(zero_copy_only=False)
+
+    # First occurrence of each unique norm, minus the empty ones
+    first_rows = np.unique(codes, return_index=True)[1]
+    first_rows = np.sort(first_rows[unique_lengths[codes[first_rows]] > 0])
+
+    out = df.iloc[first_rows].copy()
+    out["drug_norm"] = pd.arrays.ArrowExtensionArray(norms.take(first_rows))
+    return out
+
+
+def standardize_columns(df: pd.DataFrame,
                        source: str = "fda") -> pd.DataFrame:
     """Standardize column names across different sources."""
     if source == "fda":
@@ -126,60 +206,64 @@ def standardize_columns(df: pd.DataFrame,
     return df
 
 
+def prepare_fda(fda_source: str = "fda_clean",
+                raw_dir: Path = Path("data/raw")
+                ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Load, standardize, and norm-prepare the FDA side once.
+    Returns (full_df, matching_df): the full frame feeds ID matching,
+    the normalized/deduped frame feeds fuzzy matching. Multi-variant
+    runs share one result instead of redoing this per variant.
+    """
+    fda_df = standardize_columns(load_dataset(fda_source, raw_dir), "fda")
+    return fda_df, prepare_for_matching(fda_df)
+
+
 def run_comparison(
     cdsco_source: str = "cdsco_clean",
     fda_source: str = "fda_clean",
     output_file: Optional[Path] = None,
     raw_dir: Path = Path("data/raw"),
     use_exploded: bool = False,
+    fda_data: Optional[Tuple[pd.DataFrame, pd.DataFrame]] = None,
     **thresholds
 ) -> Tuple[pd.DataFrame, str]:
     """
     Core comparison logic with optimized performance.
     Returns (results_df, output_path) tuple.
+    fda_data: optional pre-built result of prepare_fda, shared across
+    variants in multi-variant mode.
     """
     # Use exploded variant if requested
     if use_exploded and cdsco_source == "cdsco_clean":
         cdsco_source = "cdsco_exploded"
-    
+
     logger.info(f"Comparing {cdsco_source} vs {fda_source}")
-    
+
     # Load and prepare datasets
     cdsco_df = load_dataset(cdsco_source, raw_dir)
-    fda_df = load_dataset(fda_source, raw_dir)
-    
+    if fda_data is None:
+        fda_data = prepare_fda(fda_source, raw_dir)
+    fda_df, fda_matching_df = fda_data
+
     # Special handling for names-only variant
     if cdsco_source == "cdsco_clean_names_only":
         logger.info("Enriching names-only data")
         cdsco_df = enrich_names_only(cdsco_df, raw_dir)
-    
-    # Standardize columns
-    fda_df = standardize_columns(fda_df, "fda")
-    
+
     logger.info(
         f"Loaded {len(cdsco_df)} CDSCO and {len(fda_df)} FDA entries"
     )
-    
+
     # Phase 1: ID-based matching (100% accurate)
     id_matches, remaining_cdsco = process_id_matches(cdsco_df, fda_df)
     logger.info(f"Found {len(id_matches)} RxNorm ID matches")
-    
-    # Phase 2: Prepare for fuzzy matching
-    remaining_cdsco["drug_norm"] = remaining_cdsco["Drug Name"].apply(
-        normalize
-    )
-    fda_df["drug_norm"] = fda_df["Drug Name"].apply(normalize)
-    
-    # Remove empty/invalid entries
-    remaining_cdsco = remaining_cdsco[
-        remaining_cdsco["drug_norm"].str.len() > 0
-    ]
-    fda_df = fda_df[fda_df["drug_norm"].str.len() > 0]
-    
-    # Deduplicate to ensure 1:1 matching
-    remaining_cdsco = remaining_cdsco.drop_duplicates(subset=["drug_norm"])
-    fda_df = fda_df.drop_duplicates(subset=["drug_norm"])
-    
+
+    # Phase 2: normalize, drop empty names, and dedup in one fused
+    # Arrow pass; the FDA side was prepared once up front
+    remaining_cdsco = prepare_for_matching(remaining_cdsco)
+    fda_df = fda_matching_df
+
     logger.info(
         f"Fuzzy matching: {len(remaining_cdsco)} CDSCO vs {len(fda_df)} FDA"
     )
@@ -202,27 +286,32 @@ def run_comparison(
     
     # Post-processing: ensure 1:1 correspondence
     if not results_df.empty:
-        # Remove duplicates, keeping highest scoring match
+        # Keep the highest-scoring match per drug on each side via
+        # groupby-idxmax; only the much smaller survivor set gets sorted
+        results_df = results_df.loc[
+            results_df.groupby('CDSCO Drug Name')['Similarity Score'].idxmax()
+        ]
+        results_df = results_df.loc[
+            results_df.groupby('FDA Drug Name')['Similarity Score'].idxmax()
+        ]
         results_df = results_df.sort_values(
             'Similarity Score', ascending=False
-        )
-        results_df = results_df.drop_duplicates(
-            subset=['CDSCO Drug Name'], keep='first'
-        )
-        results_df = results_df.drop_duplicates(
-            subset=['FDA Drug Name'], keep='first'
-        )
-        results_df = results_df.reset_index(drop=True)
+        ).reset_index(drop=True)
     
-    # Determine output path
+    # Determine output path; Parquet+zstd is the default, CSV opt-in
+    # via an explicit .csv output path
     if output_file is None:
         suffix = f"_{cdsco_source}" if cdsco_source != "cdsco_clean" else ""
-        output_file = PROC / f"overlap{suffix}.csv"
-    
+        output_file = PROC / f"overlap{suffix}.parquet"
+    output_file = Path(output_file)
+
     # Save results
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    results_df.to_csv(output_file, index=False)
-    
+    if output_file.suffix == ".csv":
+        results_df.to_csv(output_file, index=False)
+    else:
+        results_df.to_parquet(output_file, compression="zstd", index=False)
+
     logger.info(f"Saved {len(results_df)} matches to {output_file}")
     
     return results_df, str(output_file)
@@ -262,7 +351,9 @@ Examples:
                         help="Use exploded combination drugs")
     
     # Output options
-    parser.add_argument("--output", type=Path, help="Output CSV path")
+    parser.add_argument("--output", type=Path,
+                        help="Output path (.csv writes CSV, otherwise "
+                             "Parquet+zstd)")
     parser.add_argument("--raw-dir", type=Path, default=Path("data/raw"),
                         help="Raw data directory")
     
@@ -288,10 +379,13 @@ Examples:
     
     if args.multi_variant:
         # Run all CDSCO variants
-        variants = ["cdsco_clean_names_only", "unclean_cdsco", 
+        variants = ["cdsco_clean_names_only", "unclean_cdsco",
                    "vikram_cdsco_clean"]
         print("\n🔄 Running multi-variant comparison...")
-        
+
+        # Prepare the shared FDA side once for all variants
+        fda_data = prepare_fda(args.fda, args.raw_dir)
+
         for variant in variants:
             print(f"\n📊 Processing {variant}...")
             try:
@@ -300,6 +394,7 @@ Examples:
                     fda_source=args.fda,
                     raw_dir=args.raw_dir,
                     use_exploded=args.use_exploded,
+                    fda_data=fda_data,
                     jaro=args.jaro,
                     jaccard=args.jaccard,
                     token=args.token,
@@ -24,10 +24,10 @@ python compare.py $EXPLODE_FLAG
 # Summary
 echo ""
 echo "✅ Pipeline complete!"
-echo "📁 Results saved to: data/processed/overlap.csv"
+echo "📁 Results saved to: data/processed/overlap.parquet"
 
 # Show match count
-if [ -f "data/processed/overlap.csv" ]; then
-    MATCHES=$(tail -n +2 "data/processed/overlap.csv" | wc -l)
+if [ -f "data/processed/overlap.parquet" ]; then
+    MATCHES=$(python -c "import pandas as pd; print(len(pd.read_parquet('data/processed/overlap.parquet')))")
     echo "🎯 Total matches found: $MATCHES"
 fi
@@ -3,9 +3,9 @@ set -e
 
 echo "🔄 Running multi-variant CDSCO vs FDA comparison..."
 echo "This will create separate overlap files for each CDSCO variant:"
-echo "  - overlap_cdsco_clean_names_only.csv"
-echo "  - overlap_unclean_cdsco.csv"
-echo "  - overlap_vikram_cdsco_clean.csv"
+echo "  - overlap_cdsco_clean_names_only.parquet"
+echo "  - overlap_unclean_cdsco.parquet"
+echo "  - overlap_vikram_cdsco_clean.parquet"
 echo ""
 
 # Run unified script in multi-variant mode
@@ -16,17 +16,17 @@ echo "✅ Multi-variant comparison complete!"
 echo "📁 Results saved in data/processed/"
 echo ""
 echo "Summary of matches found:"
-if [ -f "data/processed/overlap_cdsco_clean_names_only.csv" ]; then
-    names_only_count=$(tail -n +2 "data/processed/overlap_cdsco_clean_names_only.csv" | wc -l)
+if [ -f "data/processed/overlap_cdsco_clean_names_only.parquet" ]; then
+    names_only_count=$(python -c "import pandas as pd; print(len(pd.read_parquet('data/processed/overlap_cdsco_clean_names_only.parquet')))")
     echo "  - Names only variant: $names_only_count matches"
 fi
 
-if [ -f "data/processed/overlap_unclean_cdsco.csv" ]; then
-    unclean_count=$(tail -n +2 "data/processed/overlap_unclean_cdsco.csv" | wc -l)
+if [ -f "data/processed/overlap_unclean_cdsco.parquet" ]; then
+    unclean_count=$(python -c "import pandas as pd; print(len(pd.read_parquet('data/processed/overlap_unclean_cdsco.parquet')))")
     echo "  - Unclean variant: $unclean_count matches"
 fi
 
-if [ -f "data/processed/overlap_vikram_cdsco_clean.csv" ]; then
-    vikram_count=$(tail -n +2 "data/processed/overlap_vikram_cdsco_clean.csv" | wc -l)
+if [ -f "data/processed/overlap_vikram_cdsco_clean.parquet" ]; then
+    vikram_count=$(python -c "import pandas as pd; print(len(pd.read_parquet('data/processed/overlap_vikram_cdsco_clean.parquet')))")
     echo "  - Vikram cleaned variant: $vikram_count matches"
 fi 
\ No newline at end of file
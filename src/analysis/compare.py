@@ -3,10 +3,10 @@ import logging
 from pathlib import Path
 
 import pandas as pd
-import textdistance
 from ..config import CDSCO_CLEAN, FDA_CLEAN, CDSCO_EXPLODED, PROC
 from ..utils.text import normalize, jaccard
 from rapidfuzz import fuzz
+from rapidfuzz.distance import JaroWinkler
 from ..utils.synonyms import load_synonyms
 
 # ----------------------------------------------------------------------------
@@ -42,7 +42,7 @@ def jaro(s1, s2):
     """Calculate Jaro-Winkler similarity between two strings."""
     if not isinstance(s1, str) or not isinstance(s2, str):
         return 0.0
-    return textdistance.jaro_winkler(s1, s2)
+    return JaroWinkler.normalized_similarity(s1, s2)
 
 
 def run(
@@ -140,13 +140,24 @@ def run(
                 f["drug_norm"].apply(lambda x: jaccard(name, x) >= jaccard_threshold)
             ]
             for _, fda_row in candidates.iterrows():
-                # Compute similarity scores
+                # Compute similarity scores cheapest-first; score_cutoff
+                # lets RapidFuzz prune internally and a sub-threshold
+                # score comes back as 0, which never flips a vote
+                ratio_score = fuzz.ratio(name, fda_row["drug_norm"],
+                                         score_cutoff=ratio_threshold)
+                token_score = fuzz.token_set_ratio(name, fda_row["drug_norm"],
+                                                   score_cutoff=token_threshold)
+                # If both cheap metrics failed, 2-of-3 consensus is already
+                # impossible — skip the Jaro-Winkler call entirely
+                if ratio_score < ratio_threshold and token_score < token_threshold:
+                    continue
                 jw_score = jaro(name, fda_row["drug_norm"])
-                token_score = fuzz.token_set_ratio(name, fda_row["drug_norm"])
-                # Levenshtein ratio fallback
-                ratio_score = fuzz.ratio(name, fda_row["drug_norm"])
                 # Use consensus check for high-confidence matching
                 if is_high_confidence_match(jw_score, token_score, ratio_score, threshold, token_threshold, ratio_threshold):
+                    # The cutoff scores are for voting only (a pruned
+                    # metric reads 0) — record the true values
+                    token_score = fuzz.token_set_ratio(name, fda_row["drug_norm"])
+                    ratio_score = fuzz.ratio(name, fda_row["drug_norm"])
                     match_data = {
                         "CDSCO Drug Name": row["Drug Name"],
                         "FDA Drug Name": fda_row["Drug Name"],
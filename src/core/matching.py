@@ -2,11 +2,23 @@
 Optimized fuzzy matching algorithms for drug name comparison.
 """
 
+import numpy as np
 import pandas as pd
-import textdistance
 from rapidfuzz import fuzz
+from rapidfuzz.distance import JaroWinkler
+from rapidfuzz.process import cdist
 from typing import Dict, List, Tuple
 
+try:
+    from sklearn.feature_extraction.text import CountVectorizer
+except ImportError:  # Jaccard falls back to precomputed token frozensets
+    CountVectorizer = None
+
+try:
+    from numba import njit, prange
+except ImportError:  # consensus scan falls back to NumPy masks
+    njit = None
+
 
 # Optimized thresholds based on empirical analysis
 OPTIMAL_JARO_THRESHOLD = 0.72      # Tightened for better precision
@@ -19,7 +31,7 @@ def jaro_winkler_similarity(s1: str, s2: str) -> float:
     """Calculate Jaro-Winkler similarity between two strings."""
     if not isinstance(s1, str) or not isinstance(s2, str):
         return 0.0
-    return textdistance.jaro_winkler(s1, s2)
+    return JaroWinkler.normalized_similarity(s1, s2)
 
 
 def is_high_confidence_match(jw: float, token: int, ratio: int,
@@ -49,32 +61,160 @@ def is_high_confidence_match(jw: float, token: int, ratio: int,
     return sum(criteria) >= 2
 
 
+def _jaccard_matrix_frozensets(query_names: List[str],
+                               candidate_names: List[str]) -> np.ndarray:
+    """
+    Fallback pairwise Jaccard when scikit-learn is unavailable. Token
+    frozensets and their sizes are precomputed once per side so the
+    inner loop does a single set intersection per pair instead of
+    re-splitting both strings.
+    """
+    candidate_tokens = [frozenset(name.split()) for name in candidate_names]
+    candidate_sizes = np.array([len(tokens) for tokens in candidate_tokens])
+
+    scores = np.empty((len(query_names), len(candidate_names)),
+                      dtype=np.float64)
+    for i, query in enumerate(query_names):
+        query_tokens = frozenset(query.split())
+        intersection = np.array(
+            [len(query_tokens & tokens) for tokens in candidate_tokens]
+        )
+        union = len(query_tokens) + candidate_sizes - intersection
+        scores[i] = intersection / np.maximum(union, 1)
+    return scores
+
+
+def jaccard_matrix(query_names: List[str],
+                   candidate_names: List[str]) -> np.ndarray:
+    """
+    Compute the full pairwise Jaccard similarity matrix via a sparse
+    token-document incidence matrix, so all set intersections reduce to
+    a single sparse matrix product.
+
+    Args:
+        query_names: Normalized query drug names
+        candidate_names: Normalized candidate drug names
+
+    Returns:
+        Array of shape (len(query_names), len(candidate_names))
+    """
+    if CountVectorizer is None:
+        return _jaccard_matrix_frozensets(query_names, candidate_names)
+
+    vectorizer = CountVectorizer(binary=True, dtype=np.int32,
+                                 tokenizer=str.split, token_pattern=None)
+    candidate_matrix = vectorizer.fit_transform(candidate_names)
+    query_matrix = vectorizer.transform(query_names)
+
+    candidate_sizes = np.asarray(candidate_matrix.sum(axis=1)).ravel()
+    # Count tokens from the raw strings so out-of-vocabulary query tokens
+    # still enlarge the union
+    query_sizes = np.array([len(set(q.split())) for q in query_names])
+
+    intersection = (query_matrix @ candidate_matrix.T).toarray()
+    union = query_sizes[:, None] + candidate_sizes[None, :] - intersection
+    return intersection / np.maximum(union, 1)
+
+
 def vectorized_jaccard_filter(query_name: str, candidate_names: pd.Series,
                             threshold: float = OPTIMAL_JACCARD_THRESHOLD) -> pd.Series:
     """
     Optimized Jaccard similarity filtering using vectorized operations.
-    
+
     Args:
         query_name: Normalized query drug name
         candidate_names: Series of normalized candidate drug names
         threshold: Jaccard similarity threshold
-        
+
     Returns:
         Boolean mask for candidates above threshold
     """
-    query_tokens = set(query_name.split())
-    
-    def jaccard_score(candidate: str) -> float:
-        if not candidate:
-            return 0.0
-        candidate_tokens = set(candidate.split())
-        intersection = len(query_tokens & candidate_tokens)
-        union = len(query_tokens | candidate_tokens)
-        return intersection / union if union > 0 else 0.0
-    
-    # Vectorized application
-    scores = candidate_names.apply(jaccard_score)
-    return scores >= threshold
+    scores = jaccard_matrix([query_name], candidate_names.tolist())[0]
+    return pd.Series(scores >= threshold, index=candidate_names.index)
+
+
+def _consensus_pairs_numpy(jw_scores, token_scores, ratio_scores, jaccard_scores,
+                           jw_threshold, token_threshold, ratio_threshold,
+                           jaccard_threshold, block_rows=256):
+    """
+    NumPy fallback for the consensus scan when numba is unavailable.
+
+    Scans the score matrices in row blocks with in-place vote
+    accumulation, so peak extra memory is a few block-sized buffers
+    rather than three full N x M boolean temporaries.
+    """
+    n_rows = jw_scores.shape[0]
+    out_i, out_j = [], []
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        votes = (jw_scores[start:stop] >= jw_threshold).astype(np.int8)
+        votes += token_scores[start:stop] >= token_threshold
+        votes += ratio_scores[start:stop] >= ratio_threshold
+        mask = votes >= 2
+        mask &= jaccard_scores[start:stop] >= jaccard_threshold
+        block_i, block_j = np.nonzero(mask)
+        out_i.append(block_i + start)
+        out_j.append(block_j)
+    if not out_i:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(out_i), np.concatenate(out_j)
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _consensus_pairs(jw_scores, token_scores, ratio_scores, jaccard_scores,
+                         jw_threshold, token_threshold, ratio_threshold,
+                         jaccard_threshold):
+        """
+        JIT-compiled 2-of-3 consensus scan over dense score matrices.
+
+        Two passes: count survivors per row in parallel, prefix-sum the
+        counts into output offsets, then fill the index arrays in
+        parallel. Avoids the boolean temporaries of the NumPy version
+        and releases the GIL.
+        """
+        n, m = jw_scores.shape
+        row_counts = np.zeros(n, dtype=np.int64)
+        for i in prange(n):
+            count = 0
+            for j in range(m):
+                votes = 0
+                if jw_scores[i, j] >= jw_threshold:
+                    votes += 1
+                if token_scores[i, j] >= token_threshold:
+                    votes += 1
+                if ratio_scores[i, j] >= ratio_threshold:
+                    votes += 1
+                if votes >= 2 and jaccard_scores[i, j] >= jaccard_threshold:
+                    count += 1
+            row_counts[i] = count
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        for i in range(n):
+            offsets[i + 1] = offsets[i] + row_counts[i]
+
+        out_i = np.empty(offsets[n], dtype=np.int64)
+        out_j = np.empty(offsets[n], dtype=np.int64)
+        for i in prange(n):
+            k = offsets[i]
+            for j in range(m):
+                votes = 0
+                if jw_scores[i, j] >= jw_threshold:
+                    votes += 1
+                if token_scores[i, j] >= token_threshold:
+                    votes += 1
+                if ratio_scores[i, j] >= ratio_threshold:
+                    votes += 1
+                if votes >= 2 and jaccard_scores[i, j] >= jaccard_threshold:
+                    out_i[k] = i
+                    out_j[k] = j
+                    k += 1
+        return out_i, out_j
+
+else:
+    _consensus_pairs = _consensus_pairs_numpy
 
 
 def create_match_record(cdsco_row: pd.Series, fda_row: pd.Series,
@@ -131,39 +271,63 @@ def optimized_fuzzy_matching(cdsco_df: pd.DataFrame, fda_df: pd.DataFrame,
     """
     if synonyms is None:
         synonyms = {}
-    
+
     matches = []
-    
-    # Pre-compute FDA normalized names for vectorized operations
-    fda_names = fda_df["drug_norm"].values
-    
-    for _, cdsco_row in cdsco_df.iterrows():
-        # Apply synonym mapping
-        query_name = cdsco_row["drug_norm"]
-        query_name = synonyms.get(query_name, query_name)
-        
-        # Vectorized Jaccard pre-filtering
-        jaccard_mask = vectorized_jaccard_filter(query_name, fda_df["drug_norm"], 
-                                               jaccard_threshold)
-        candidates = fda_df[jaccard_mask]
-        
-        # Early termination if no candidates pass Jaccard filter
-        if candidates.empty:
-            continue
-            
-        # Compute similarities for filtered candidates
-        for _, fda_row in candidates.iterrows():
-            jw_score = jaro_winkler_similarity(query_name, fda_row["drug_norm"])
-            token_score = fuzz.token_set_ratio(query_name, fda_row["drug_norm"])
-            ratio_score = fuzz.ratio(query_name, fda_row["drug_norm"])
-            
-            # Apply consensus matching
-            if is_high_confidence_match(jw_score, token_score, ratio_score,
-                                      jw_threshold, token_threshold, ratio_threshold):
-                match_record = create_match_record(cdsco_row, fda_row, 
-                                                 jw_score, token_score, ratio_score)
-                matches.append(match_record)
-    
+
+    # Apply synonym mapping as a vectorized Series operation
+    cdsco_norms = cdsco_df["drug_norm"]
+    query_names = cdsco_norms.map(synonyms).fillna(cdsco_norms).tolist()
+    fda_names = fda_df["drug_norm"].tolist()
+
+    if not query_names or not fda_names:
+        return matches
+
+    # Batch-score all (CDSCO, FDA) pairs in native code instead of
+    # per-pair Python calls. score_cutoff lets RapidFuzz short-circuit
+    # pairs whose length difference already bounds the score below the
+    # threshold; pruned pairs score 0, which never flips a consensus
+    # vote since each cutoff equals that metric's own threshold.
+    token_scores = cdist(query_names, fda_names,
+                         scorer=fuzz.token_set_ratio,
+                         score_cutoff=token_threshold,
+                         workers=-1, dtype=np.uint8)
+    ratio_scores = cdist(query_names, fda_names,
+                         scorer=fuzz.ratio,
+                         score_cutoff=ratio_threshold,
+                         workers=-1, dtype=np.uint8)
+    # Jaro-Winkler is scaled by 100 into uint8 alongside the two ratio
+    # matrices: one-byte cells quarter the memory traffic of float32
+    # during the consensus scan
+    jw_scores = cdist(query_names, fda_names,
+                      scorer=JaroWinkler.normalized_similarity,
+                      score_cutoff=jw_threshold, score_multiplier=100,
+                      workers=-1, dtype=np.uint8)
+    jw_quantized_threshold = round(jw_threshold * 100)
+
+    # Jaccard pre-filter as one sparse matrix product over all pairs
+    jaccard_scores = jaccard_matrix(query_names, fda_names)
+
+    # 2-of-3 consensus + Jaccard gate in one scan over the score matrices
+    match_i, match_j = _consensus_pairs(
+        jw_scores, token_scores, ratio_scores, jaccard_scores,
+        jw_quantized_threshold, token_threshold, ratio_threshold,
+        jaccard_threshold
+    )
+
+    # Iterate only the sparse surviving pairs. The cutoff/quantized
+    # matrices are for voting only — cells below a cutoff hold 0 — so
+    # re-score each survivor exactly for the reported record
+    for i, j in zip(match_i, match_j):
+        query_name = query_names[i]
+        candidate_name = fda_names[j]
+        match_record = create_match_record(
+            cdsco_df.iloc[i], fda_df.iloc[j],
+            JaroWinkler.normalized_similarity(query_name, candidate_name),
+            fuzz.token_set_ratio(query_name, candidate_name),
+            fuzz.ratio(query_name, candidate_name)
+        )
+        matches.append(match_record)
+
     return matches
 
 
@@ -180,32 +344,31 @@ def process_id_matches(cdsco_df: pd.DataFrame, fda_df: pd.DataFrame,
     Returns:
         Tuple of (id_matches_list, remaining_cdsco_df)
     """
-    id_matches = []
-    
     if id_column in cdsco_df.columns and id_column in fda_df.columns:
         id_c = cdsco_df[cdsco_df[id_column].notna()]
         id_f = fda_df[fda_df[id_column].notna()]
         id_pairs = id_c.merge(id_f, on=id_column, suffixes=('_cdsco', '_fda'))
-        
-        for _, pair in id_pairs.iterrows():
-            match_record = {
-                'CDSCO Drug Name': pair['Drug Name_cdsco'],
-                'FDA Drug Name': pair['Drug Name_fda'],
-                'Similarity Score': 1.0,
-                'Token Score': 100,
-                'Ratio Score': 100,
-                'Match Type': 'RxNorm',
-                'CDSCO Approval Date': pair.get('Date of Approval_cdsco', ''),
-                'FDA Approval Date': pair.get('Date of Approval_fda', ''),
-                'CDSCO Indication': pair.get('Indication_cdsco', ''),
-                'FDA Indication': pair.get('Indication_fda', ''),
-            }
-            id_matches.append(match_record)
-        
+
+        # Assemble all match records via column selection instead of
+        # per-row dict construction
+        records = pd.DataFrame({
+            'CDSCO Drug Name': id_pairs['Drug Name_cdsco'],
+            'FDA Drug Name': id_pairs['Drug Name_fda'],
+            'Similarity Score': 1.0,
+            'Token Score': 100,
+            'Ratio Score': 100,
+            'Match Type': 'RxNorm',
+            'CDSCO Approval Date': id_pairs.get('Date of Approval_cdsco', ''),
+            'FDA Approval Date': id_pairs.get('Date of Approval_fda', ''),
+            'CDSCO Indication': id_pairs.get('Indication_cdsco', ''),
+            'FDA Indication': id_pairs.get('Indication_fda', ''),
+        })
+        id_matches = records.to_dict('records')
+
         # Remove ID-matched entries from fuzzy matching pool
         matched_ids = set(id_pairs[id_column])
         remaining_cdsco = cdsco_df[~cdsco_df[id_column].isin(matched_ids)]
-        
+
         return id_matches, remaining_cdsco
-    
-    return id_matches, cdsco_df 
\ No newline at end of file
+
+    return [], cdsco_df
\ No newline at end of file
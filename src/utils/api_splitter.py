@@ -4,7 +4,7 @@ Utilities for splitting combination drug names into individual API components.
 
 import re
 import logging
-import textdistance
+from rapidfuzz.distance import JaroWinkler
 from typing import List, Set, Tuple
 from .text import normalize
 
@@ -120,7 +120,7 @@ def _best_vocab_match(term: str, vocab: Set[str]) -> Tuple[str, float]:
     best_match = ""
     
     for vocab_term in vocab:
-        score = textdistance.jaro_winkler(norm_term, vocab_term)
+        score = JaroWinkler.normalized_similarity(norm_term, vocab_term)
         if score > best_score:
             best_score = score
             best_match = vocab_term
@@ -3,6 +3,7 @@ Utilities for loading drug name synonyms to improve matching accuracy.
 """
 import json
 import logging
+import sys
 from pathlib import Path
 from ..config import ROOT
 
@@ -24,8 +25,10 @@ def load_synonyms():
     try:
         with open(SYNONYMS_PATH, 'r', encoding='utf-8') as f:
             data = json.load(f)
-        # Ensure keys and values are lowercase normalized
-        norm_map = {k.lower(): v.lower() for k, v in data.items()}
+        # Ensure keys and values are lowercase normalized; intern so
+        # lookups against interned drug norms hit pointer equality
+        norm_map = {sys.intern(k.lower()): sys.intern(v.lower())
+                    for k, v in data.items()}
         logging.info(f"Loaded {len(norm_map)} synonyms from {SYNONYMS_PATH}")
         return norm_map
     except Exception as e:
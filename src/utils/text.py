@@ -1,13 +1,29 @@
 # Reduce to essential text normalization utilities
-import re, unicodedata
+import re, sys, unicodedata
+from functools import lru_cache
 
+import pandas as pd
 
+
+@lru_cache(maxsize=None)
 def normalize(txt: str) -> str:
-    if txt is None:
+    # Non-strings (None, NaN, pd.NA) normalize to the empty string so
+    # missing names are dropped identically on every prep path
+    if not isinstance(txt, str):
         return ""
     txt = unicodedata.normalize("NFKD", txt.lower())
     txt = re.sub(r"[^a-z0-9 ]", " ", txt)
-    return re.sub(r"\s+", " ", txt).strip()
+    # Intern so equal norms share one object: equality degenerates to a
+    # pointer check in the hashing-heavy dedup and lookup steps
+    return sys.intern(re.sub(r"\s+", " ", txt).strip())
+
+
+def normalize_series(series: pd.Series) -> pd.Series:
+    # Normalize each unique value once, then broadcast with map;
+    # drug columns are heavy on duplicates (shared ingredients).
+    # Missing values skip the map, so fill them like normalize does
+    mapping = {value: normalize(value) for value in series.unique()}
+    return series.map(mapping).fillna("")
 
 
 def jaccard(a: str, b: str) -> float:
@@ -1,7 +1,10 @@
 # Create a new test file for compare functions
+import pandas as pd
 import pytest
 from src.analysis.compare import jaro
 
+import compare
+
 
 def test_jaro():
     assert jaro("hello", "hello") == 1.0
@@ -9,4 +12,26 @@ def test_jaro():
     assert jaro("hello", "world") < 0.5
     assert jaro("", "") == 1.0
     assert jaro("a", "") == 0.0
-    assert jaro("", "a") == 0.0 
\ No newline at end of file
+    assert jaro("", "a") == 0.0
+
+
+def _names_frame():
+    # Duplicate norms, a missing name, and a whitespace-only name
+    return pd.DataFrame({
+        "Drug Name": ["Imatinib", "imatinib!", None, "  ", "Paracetamol"]
+    })
+
+
+def test_prepare_for_matching_polars_path():
+    if compare.pl is None:
+        pytest.skip("polars not installed")
+    out = compare.prepare_for_matching(_names_frame())
+    assert out["drug_norm"].tolist() == ["imatinib", "paracetamol"]
+    assert out["Drug Name"].tolist() == ["Imatinib", "Paracetamol"]
+
+
+def test_prepare_for_matching_arrow_path(monkeypatch):
+    monkeypatch.setattr(compare, "pl", None)
+    out = compare.prepare_for_matching(_names_frame())
+    assert out["drug_norm"].tolist() == ["imatinib", "paracetamol"]
+    assert out["Drug Name"].tolist() == ["Imatinib", "Paracetamol"] 
\ No newline at end of file
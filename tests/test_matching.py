@@ -1,6 +1,9 @@
+import numpy as np
+import pandas as pd
 import pytest
 
 from src.analysis.compare import is_high_confidence_match
+from src.core import matching
 
 
 def test_all_metrics_above_threshold():
@@ -25,4 +28,71 @@ def test_one_metric_above_threshold():
 def test_edge_threshold_values():
     # Metrics equal to thresholds count as exceeding
     assert is_high_confidence_match(0.85, 85, 84, 0.85, 85, 85)
-    assert is_high_confidence_match(0.84, 85, 85, 0.85, 85, 85) 
\ No newline at end of file
+    assert is_high_confidence_match(0.84, 85, 85, 0.85, 85, 85)
+
+
+def _random_score_matrices(n, m, seed=0):
+    rng = np.random.default_rng(seed)
+    jw = rng.integers(0, 101, (n, m)).astype(np.uint8)
+    tok = rng.integers(0, 101, (n, m)).astype(np.uint8)
+    rat = rng.integers(0, 101, (n, m)).astype(np.uint8)
+    jac = rng.random((n, m))
+    return jw, tok, rat, jac
+
+
+def test_consensus_pairs_numpy_matches_reference():
+    jw, tok, rat, jac = _random_score_matrices(40, 30)
+    expected = [
+        (i, j)
+        for i in range(jw.shape[0])
+        for j in range(jw.shape[1])
+        # int() casts matter: adding numpy bool scalars is logical OR
+        if (int(jw[i, j] >= 72) + int(tok[i, j] >= 82) + int(rat[i, j] >= 82)) >= 2
+        and jac[i, j] >= 0.1
+    ]
+    out_i, out_j = matching._consensus_pairs_numpy(
+        jw, tok, rat, jac, 72, 82, 82, 0.1
+    )
+    assert list(zip(out_i, out_j)) == expected
+
+
+def test_consensus_scan_implementations_agree():
+    # The numba kernel (when importable) and the blocked NumPy fallback
+    # must emit identical pair indices; span a block boundary
+    jw, tok, rat, jac = _random_score_matrices(300, 50, seed=1)
+    fast_i, fast_j = matching._consensus_pairs(jw, tok, rat, jac, 72, 82, 82, 0.1)
+    slow_i, slow_j = matching._consensus_pairs_numpy(
+        jw, tok, rat, jac, 72, 82, 82, 0.1, block_rows=64
+    )
+    assert np.array_equal(fast_i, slow_i)
+    assert np.array_equal(fast_j, slow_j)
+
+
+def test_jaccard_matrix_known_values():
+    scores = matching.jaccard_matrix(["a b", "a c d"], ["a b", "c"])
+    assert scores[0, 0] == 1.0
+    assert scores[0, 1] == 0.0
+    assert scores[1, 0] == pytest.approx(0.25)
+    assert scores[1, 1] == pytest.approx(1 / 3)
+
+
+def test_jaccard_matrix_matches_frozenset_fallback():
+    queries = ["imatinib mesylate", "paracetamol", ""]
+    candidates = ["imatinib mesylate", "imatinib", "ibuprofen tablets"]
+    sparse = matching.jaccard_matrix(queries, candidates)
+    fallback = matching._jaccard_matrix_frozensets(queries, candidates)
+    assert np.allclose(sparse, fallback)
+
+
+def test_optimized_fuzzy_matching_reports_true_scores():
+    # A pair passing consensus via token+ratio must still record the
+    # real Jaro-Winkler score, not the cutoff-pruned zero
+    cdsco = pd.DataFrame({"Drug Name": ["Imatinib Mesilate"],
+                          "drug_norm": ["imatinib mesilate"]})
+    fda = pd.DataFrame({"Drug Name": ["Imatinib Mesylate"],
+                        "drug_norm": ["imatinib mesylate"]})
+    matches = matching.optimized_fuzzy_matching(cdsco, fda, jw_threshold=0.99)
+    assert len(matches) == 1
+    assert 0.9 < matches[0]["Similarity Score"] < 0.99
+    assert matches[0]["Token Score"] >= 82
+    assert matches[0]["Ratio Score"] >= 82
\ No newline at end of file
@@ -1,6 +1,7 @@
 # Create a new test file for text utilities
+import pandas as pd
 import pytest
-from src.utils.text import normalize, jaccard
+from src.utils.text import normalize, normalize_series, jaccard
 
 
 def test_normalize():
@@ -10,6 +11,19 @@ def test_normalize():
     assert normalize("") == ""
 
 
+def test_normalize_non_string():
+    # Missing values from any backend normalize to the empty string
+    assert normalize(float("nan")) == ""
+    assert normalize(pd.NA) == ""
+
+
+def test_normalize_series():
+    series = pd.Series(["Hello, World!", None, "Hello, World!", "  "])
+    assert normalize_series(series).tolist() == [
+        "hello world", "", "hello world", ""
+    ]
+
+
 def test_jaccard():
     assert jaccard("hello world", "hello") == 0.3333333333333333
     assert jaccard("hello world", "world hello") == 0.6666666666666666
@@ -2,7 +2,8 @@
 """
 synonyms_check.py
 
-Script to verify which CDSCO raw names mapped via synonyms appear in overlap.csv.
+Script to verify which CDSCO raw names mapped via synonyms appear in the
+overlap results (data/processed/overlap.parquet, the pipeline default).
 """
 import json
 import pandas as pd
@@ -20,7 +21,7 @@ for raw in raw_names:
     norm = normalize(raw)
     rev_map.setdefault(norm, []).append(raw)
 # Load overlap results
-ov = pd.read_csv('data/processed/overlap.csv')
+ov = pd.read_parquet('data/processed/overlap.parquet')
 matched = set(ov['CDSCO Drug Name'].unique())
 # Check mapping results
 matched_raw = []